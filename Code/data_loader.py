@@ -5,6 +5,16 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# python-calamine parses spreadsheets much faster than openpyxl/odfpy;
+# fall back to pandas' default engine when it is not installed or when
+# pandas predates calamine support (added in 2.2).
+try:
+    import python_calamine  # noqa: F401
+    _pandas_version = tuple(int(part) for part in pd.__version__.split(".")[:2])
+    EXCEL_ENGINE = "calamine" if _pandas_version >= (2, 2) else None
+except (ImportError, ValueError):
+    EXCEL_ENGINE = None
+
 
 def validate_file_exists(filepath, description):
     if not os.path.exists(filepath):
@@ -16,6 +26,39 @@ def validate_file_exists(filepath, description):
     logger.info(f"Found {description}: {os.path.basename(filepath)}")
 
 
+def load_cached_array(filepath, cache_key, parse):
+    """
+    Return the array produced by ``parse()``, cached next to ``filepath``.
+    
+    The parsed array is saved as ``<filepath>.<cache_key>.npy`` and reused
+    on later runs as long as it is newer than the source spreadsheet. A
+    cache that cannot be read is treated as missing and rebuilt.
+    """
+    cache_path = f"{filepath}.{cache_key}.npy"
+    if (os.path.exists(cache_path)
+            and os.path.getmtime(cache_path) >= os.path.getmtime(filepath)):
+        try:
+            data = np.load(cache_path)
+            logger.info(f"Using cached data: {os.path.basename(cache_path)}")
+            return data
+        except (OSError, ValueError, EOFError) as e:
+            logger.warning(f"Ignoring unreadable cache {cache_path}: {e}")
+    
+    data = parse()
+    # Write to a per-process temporary file and rename it into place, so
+    # neither a crash nor a concurrent run can see a partial cache
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            np.save(f, data)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"Could not write cache {cache_path}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return data
+
+
 def load_io_matrix(script_dir, filename, sheet_name, n):
     filepath = os.path.join(script_dir, filename)
     validate_file_exists(filepath, "IO matrix file")
@@ -23,8 +66,14 @@ def load_io_matrix(script_dir, filename, sheet_name, n):
     logger.info(f"Loading IO matrix from {filename}, sheet '{sheet_name}'")
     
     try:
-        io_df = pd.read_excel(filepath, sheet_name=sheet_name, header=None)
-        A = io_df.iloc[3:67, 2:66].to_numpy(dtype=float)
+        def parse():
+            # Rows 4 onwards, columns C onwards; nothing else is parsed
+            io_df = pd.read_excel(filepath, sheet_name=sheet_name, header=None,
+                                  skiprows=3, nrows=n, usecols=range(2, 2 + n),
+                                  engine=EXCEL_ENGINE)
+            return io_df.to_numpy(dtype=float)
+        
+        A = load_cached_array(filepath, f"{sheet_name}.n{n}", parse)
         
         if A.shape != (n, n):
             raise ValueError(
@@ -48,8 +97,12 @@ def load_value_added(script_dir, filename, n):
     logger.info(f"Loading value added data from {filename}")
     
     try:
-        va_df = pd.read_excel(va_filepath, header=None)
-        value_added = va_df.iloc[0, 0:n].to_numpy(dtype=float)
+        def parse():
+            va_df = pd.read_excel(va_filepath, header=None, nrows=1,
+                                  usecols=range(n), engine=EXCEL_ENGINE)
+            return va_df.iloc[0].to_numpy(dtype=float)
+        
+        value_added = load_cached_array(va_filepath, f"n{n}", parse)
         
         if len(value_added) != n:
             raise ValueError(
@@ -72,15 +125,21 @@ def load_consumption_and_output(script_dir, filename, n):
     logger.info(f"Loading consumption and output data from {filename}")
     
     try:
-        df = pd.read_excel(filepath, header=None)
+        def parse():
+            # Columns A, C, E, G, rows 3-67
+            df = pd.read_excel(filepath, header=None, skiprows=2, nrows=n,
+                               usecols=[0, 2, 4, 6], engine=EXCEL_ENGINE)
+            return df.to_numpy(dtype=float)
+        
+        table = load_cached_array(filepath, f"n{n}", parse)
         
         # Total output from column G (index 6), rows 3-67
-        total_output = 1e+6 * df.iloc[2:66, 6].to_numpy(dtype=float)
+        total_output = 1e+6 * table[:, 3]
         
         # Final demand components
-        C_household = 1e+6 * df.iloc[2:66, 0].to_numpy(dtype=float)
-        I_investment = 1e+6 * df.iloc[2:66, 2].to_numpy(dtype=float)
-        G_government = 1e+6 * df.iloc[2:66, 4].to_numpy(dtype=float)
+        C_household = 1e+6 * table[:, 0]
+        I_investment = 1e+6 * table[:, 1]
+        G_government = 1e+6 * table[:, 2]
         
         # Validate dimensions
         for name, data in [
@@ -108,13 +167,24 @@ def load_consumption_and_output(script_dir, filename, n):
 
 
 def compute_value_added_per_unit(value_added, total_output):
-    va_per_unit = value_added / total_output
-    va_per_unit = np.nan_to_num(va_per_unit, nan=0.0, posinf=0.0, neginf=0.0)
+    # Sectors with no output or missing value added get zero per unit
+    va_per_unit = np.zeros_like(value_added, dtype=float)
+    valid = (total_output != 0) & np.isfinite(total_output) & np.isfinite(value_added)
+    np.divide(value_added, total_output, out=va_per_unit, where=valid)
     
     logger.info("Computed value added per unit of output")
     return va_per_unit
 
 
+def compute_base_prices(A, va_per_unit):
+    # Base prices solve P = A^T P + wL, i.e. (I - A^T) P = wL
+    n = A.shape[0]
+    P0_real = np.linalg.solve(np.eye(n) - A.T, va_per_unit)
+    
+    logger.info("Computed base prices from value added per unit")
+    return P0_real
+
+
 def load_all_data(config, script_dir):
     logger.info("=" * 60)
     logger.info("LOADING DATA FILES")
@@ -150,6 +220,9 @@ def load_all_data(config, script_dir):
         cons_data['total_output']
     )
     
+    # Base prices, shared by the simulation and the convergence test
+    P0_real = compute_base_prices(A, va_per_unit)
+    
     logger.info("=" * 60)
     logger.info("DATA LOADING COMPLETE")
     logger.info("=" * 60)
@@ -159,6 +232,7 @@ def load_all_data(config, script_dir):
         'A': A,
         'value_added': value_added,
         'va_per_unit': va_per_unit,
+        'P0_real': P0_real,
         'total_output': cons_data['total_output'],
         'C_household': cons_data['C_household'],
         'I_investment': cons_data['I_investment'],
@@ -6,6 +6,7 @@ import logging
 import yaml
 from datetime import datetime
 import pandas as pd
+from scipy.linalg import lu_factor, lu_solve
 import data_loader
 import model
 import plotting
@@ -54,29 +55,38 @@ def initialize_simulation(config, data):
     logger.info("=" * 60)
     
     n = config['n']
-    k = config['k']
     T_plan = config['T_plan']
     W = config['W']
     T = T_plan + W
 
-    np.random.seed(None)
-    logger.info(f"Random seed set to {config['random_seed']}")
+    # One generator drives every random draw of the run
+    rng = np.random.default_rng(config.get('random_seed'))
+    logger.info(f"Random seed set to {config.get('random_seed')}")
     
-    Delta = model.create_delta_matrix(config)
-    B, B_inv = model.create_capital_intensity_matrix(config)
+    # Delta and B are diagonal, so only their diagonals are kept
+    delta_vec = model.create_delta_vector(config, rng)
+    b_diag, b_inv_diag = model.create_capital_intensity_vector(config, rng)
     mu = model.create_mu_vector(config)
+    I_minus_Delta = 1.0 - delta_vec
     
-    states = model.initialize_state_arrays(T, n)
+    states, state_buffer = model.initialize_state_arrays(T, n)
     
     A = data['A']
     wL = data['va_per_unit']
-    P0_real = model.neumann(A.T, wL, k)
+    
+    # Factor (I - A) once; every Leontief inverse is then two triangular solves
+    lu_piv = lu_factor(np.eye(n) - A)
+    P0_real = data['P0_real']
     P0 = P0_real.copy()
     alpha = data['C_household'] / data['C_household'].sum()
 
     epsilon = -np.ones(n)
     epsilon_measured = epsilon
     
+    # P0 is fixed for the whole run, so divide by it once here
+    P0_inv = 1.0 / P0
+    epsilon_over_P0 = epsilon_measured * P0_inv
+    
     alpha_shock = np.zeros(n)
     
     g_a = config['g_a']
@@ -87,23 +97,22 @@ def initialize_simulation(config, data):
     states['C_p'][0] = states['C'][0]
     states['G'][0] = data['G_government'] / P0
     
-    states['K'][0] = config['initial_capacity_buffer'] * (B @ (data['total_output'] / P0))
-    states['I'][0] = Delta @ states['K'][0]
+    states['K'][0] = config['initial_capacity_buffer'] * (b_diag * (data['total_output'] / P0))
+    states['I'][0] = delta_vec * states['K'][0]
     
-    states['X'][0] = model.neumann(A, states['C'][0] + states['I'][0] + states['G'][0], k)
-    states['K_e'][0] = B @ states['X'][0]
+    states['X'][0] = lu_solve(lu_piv, states['C'][0] + states['I'][0] + states['G'][0])
+    states['K_e'][0] = b_diag * states['X'][0]
     states['X_max'][0] = config['initial_capacity_buffer'] * states['X'][0]
     states['AD'][0] = states['C'][0] + states['I'][0] + states['G'][0]
     states['F'][0] = states['AD'][0]
-    states['F_c'][0] = (np.eye(n) - A) @ states['X_max'][0]
-    states['K'][0] = B @ states['X_max'][0]
+    states['F_c'][0] = states['X_max'][0] - A @ states['X_max'][0]
+    states['K'][0] = b_diag * states['X_max'][0]
     states['U'][0] = states['X_max'][0] - states['X'][0]
-    states['K_u'][0] = B @ states['U'][0]
+    states['K_u'][0] = b_diag * states['U'][0]
     
-    states['K'][1] = (np.eye(n) - Delta) @ states['K'][0] + states['I'][0]
+    states['K'][1] = I_minus_Delta * states['K'][0] + states['I'][0]
     
-    Delta_C_p_hist = []
-    Delta2_C_p_hist = []
+    Delta_C_p_prev = None
     Delta_P_last = 0
     Delta_K_e_last = np.zeros(n)
     
@@ -113,31 +122,35 @@ def initialize_simulation(config, data):
     Delta_C_p_forecaster = model.AR1Forecaster(W)
     Delta2_C_p_forecaster = model.AR1Forecaster(W)
     
-    logger.info(f"Simulation initialized: T={T}, n={n}, k={k}")
+    logger.info(f"Simulation initialized: T={T}, n={n}")
     logger.info("=" * 60)
     logger.info("")
     
     return {
         'states': states,
-        'Delta': Delta,
-        'B': B,
-        'B_inv': B_inv,
+        'state_buffer': state_buffer,
+        'delta_vec': delta_vec,
+        'I_minus_Delta': I_minus_Delta,
+        'b_diag': b_diag,
+        'b_inv_diag': b_inv_diag,
         'A': A,
+        'lu_piv': lu_piv,
         'P0': P0,
+        'P0_inv': P0_inv,
         'P0_real': P0_real,
         'wL': wL,
         'alpha': alpha,
         'alpha_shock': alpha_shock,
         'epsilon': epsilon,
         'epsilon_measured': epsilon_measured,
+        'epsilon_over_P0': epsilon_over_P0,
         'mu': mu,
+        'rng': rng,
         'g': g,
         'T': T,
         'W': W,
         'n': n,
-        'k': k,
-        'Delta_C_p_hist': Delta_C_p_hist,
-        'Delta2_C_p_hist': Delta2_C_p_hist,
+        'Delta_C_p_prev': Delta_C_p_prev,
         'Delta_P_last': Delta_P_last,
         'Delta_K_e_last': Delta_K_e_last,
         'Debt': Debt,
@@ -157,99 +170,143 @@ def run_simulation(config, sim):
     T = sim['T']
     W = sim['W']
     n = sim['n']
-    k = sim['k']
     A = sim['A']
-    B = sim['B']
-    Delta = sim['Delta']
+    lu_piv = sim['lu_piv']
+    b_diag = sim['b_diag']
+    b_inv_diag = sim['b_inv_diag']
+    delta_vec = sim['delta_vec']
+    I_minus_Delta = sim['I_minus_Delta']
     P0 = sim['P0']
+    wL = sim['wL']
+    epsilon = sim['epsilon']
+    P0_inv = sim['P0_inv']
+    epsilon_over_P0 = sim['epsilon_over_P0']
+    mu = sim['mu']
+    rng = sim['rng']
     g = sim['g']
+    g2 = g**2
     tau = config['tau']
     b = config['b']
     
     shock_sigma = config['shock_sigma']
     shock_persist = config['shock_persist']
     
+    # The loop body is dominated by interpreter overhead on n-vectors, so
+    # bind every state array and piece of carried state to a local name
+    # once instead of going through the dicts on every operation
+    X, X_max, K, K_u = (states[key] for key in ('X', 'X_max', 'K', 'K_u'))
+    I, C_p, C_0, C, F = (states[key] for key in ('I', 'C_p', 'C_0', 'C', 'F'))
+    ED, AD, G, F_c = (states[key] for key in ('ED', 'AD', 'G', 'F_c'))
+    
+    alpha = sim['alpha']
+    alpha_shock = sim['alpha_shock']
+    Delta_C_p_prev = sim['Delta_C_p_prev']
+    Delta_C_p_forecaster = sim['Delta_C_p_forecaster']
+    Delta2_C_p_forecaster = sim['Delta2_C_p_forecaster']
+    Delta_P_last = sim['Delta_P_last']
+    Delta_K_e_last = sim['Delta_K_e_last']
+    Debt = sim['Debt']
+    
+    # Scratch buffers reused every step; alpha is double-buffered with
+    # alpha_next so update_alpha can write without allocating
+    Delta_K_u = np.empty(n)
+    alpha_next = np.empty(n)
+    no_change = np.zeros(n)
+    
     for t in range(1, T):
         if t % 12 == 0:
             logger.info(f"Progress: Year {t//12}/{(T-W)//12}")
         
-        K_e_last = B @ states['X'][t-1]
+        K_e_last = b_diag * X[t-1]
         
-        K_e_hat = K_e_last + sim['Delta_K_e_last']
+        K_e_hat = K_e_last + Delta_K_e_last
         
-        states['K'][t] = (np.eye(n) - Delta) @ states['K'][t-1] + states['I'][t-1]
+        K[t] = I_minus_Delta * K[t-1] + I[t-1]
         
-        states['K_u'][t] = (1-b)*states['K'][t] - K_e_hat
+        K_u[t] = (1-b)*K[t] - K_e_hat
         
-        Delta_C_p_last = -states['C_p'][t-1] * ((sim['epsilon_measured'] * sim['Delta_P_last']) / (P0))
+        Delta_C_p_last = -C_p[t-1] * (epsilon_over_P0 * Delta_P_last)
         
-        states['C_p'][t] = states['C_p'][t-1] + Delta_C_p_last
+        C_p[t] = C_p[t-1] + Delta_C_p_last
         
-        states['G'][t] = (1+g)*states['G'][t-1]
+        G[t] = (1+g)*G[t-1]
         
-        sim['alpha'], sim['alpha_shock'] = model.update_alpha(
-            sim['alpha'], sim['alpha_shock'], shock_sigma, shock_persist, sim['mu']
+        alpha_next, alpha_shock = model.update_alpha(
+            alpha, alpha_shock, shock_sigma, shock_persist, mu, rng, out=alpha_next
         )
-        
-        sim['Delta_C_p_hist'].append(Delta_C_p_last.copy())
-        
-        if len(sim['Delta_C_p_hist']) > 1:
-            sim['Delta2_C_p_hist'].append(sim['Delta_C_p_hist'][-1] - sim['Delta_C_p_hist'][-2])
-        
-        sim['Delta_C_p_forecaster'].add_observation(Delta_C_p_last)
-        if len(sim['Delta2_C_p_hist']) > 0:
-            sim['Delta2_C_p_forecaster'].add_observation(sim['Delta2_C_p_hist'][-1])
-        
-        if len(sim['Delta_C_p_hist']) < W:
-            Delta_C_p_hat = Delta_C_p_last.copy()
-            Delta2_C_p_hat = np.zeros(n)
+        alpha, alpha_next = alpha_next, alpha
+        
+        # The forecasters hold the rolling windows; only the previous
+        # Delta_C_p is kept here to form the second difference
+        Delta_C_p_forecaster.add_observation(Delta_C_p_last)
+        if Delta_C_p_prev is not None:
+            Delta2_C_p_last = Delta_C_p_last - Delta_C_p_prev
+            Delta2_C_p_forecaster.add_observation(Delta2_C_p_last)
+        Delta_C_p_prev = Delta_C_p_last
+        
+        if Delta_C_p_forecaster.n_observations < W:
+            Delta_C_p_hat = Delta_C_p_last
+            Delta2_C_p_hat = no_change
         else:
-            sim['Delta_C_p_forecaster'].fit()
-            sim['Delta2_C_p_forecaster'].fit()
+            Delta_C_p_forecaster.fit()
+            Delta2_C_p_forecaster.fit()
             
-            Delta_C_p_hat = sim['Delta_C_p_forecaster'].predict(Delta_C_p_last)
+            Delta_C_p_hat = Delta_C_p_forecaster.predict(Delta_C_p_last)
             
-            if len(sim['Delta2_C_p_hist']) >= 2:
-                last_delta2 = sim['Delta2_C_p_hist'][-1]
-                Delta2_C_p_hat = sim['Delta2_C_p_forecaster'].predict(last_delta2)
+            if Delta2_C_p_forecaster.n_observations >= 2:
+                Delta2_C_p_hat = Delta2_C_p_forecaster.predict(Delta2_C_p_last)
             else:
-                Delta2_C_p_hat = np.zeros(n)
+                Delta2_C_p_hat = no_change
         
-        Delta_K_e = B @ model.neumann(A, Delta_C_p_hat + g*states['G'][t] + B @ model.neumann(A, Delta2_C_p_hat + (g**2)*states['G'][t], k), k)
+        # Second-order capital requirement feeds the first-order one; both
+        # solves reuse the same factorization of (I - A)
+        Delta_K_e2 = b_diag * lu_solve(lu_piv, Delta2_C_p_hat + g2*G[t],
+                                       check_finite=False)
+        Delta_K_e = b_diag * lu_solve(lu_piv, Delta_C_p_hat + g*G[t] + Delta_K_e2,
+                                     check_finite=False)
         
-        Delta_K_u = -np.minimum(Delta_K_e, states['K_u'][t])
+        np.minimum(Delta_K_e, K_u[t], out=Delta_K_u)
+        np.negative(Delta_K_u, out=Delta_K_u)
         
-        states['I'][t] = Delta @ states['K'][t] + (Delta_K_e + Delta_K_u)
+        I[t] = delta_vec * K[t] + (Delta_K_e + Delta_K_u)
         
-        states['F'][t] = states['C_p'][t] + states['I'][t] + states['G'][t]
+        F[t] = C_p[t] + I[t] + G[t]
         
-        states['X'][t] = model.neumann(A, states['F'][t], k)
+        X[t] = lu_solve(lu_piv, F[t], check_finite=False)
         
-        Taxes = (1 - tau)*P0 @ (states['I'][t] + states['G'][t])
+        Taxes = (1 - tau)*P0 @ (I[t] + G[t])
         
-        Y_income = sim['wL'] @ states['X'][t] - Taxes
+        Y_income = wL @ X[t] - Taxes
         
-        states['C_0'][t] = sim['alpha'] * Y_income / P0
+        C_0[t] = alpha * Y_income * P0_inv
         
-        states['ED'][t] = states['C_0'][t] - states['C_p'][t]
+        ED[t] = C_0[t] - C_p[t]
         
-        Delta_P = P0 * (-states['ED'][t] / (sim['epsilon'] * states['C_0'][t]))
+        Delta_P = P0 * (-ED[t] / (epsilon * C_0[t]))
         
         P = P0 + Delta_P
         
-        states['C'][t] = sim['alpha'] * Y_income / P
+        C[t] = alpha * Y_income / P
         
-        states['AD'][t] = states['C'][t] + states['I'][t] + states['G'][t]
+        AD[t] = C[t] + I[t] + G[t]
         
-        states['X_max'][t] = sim['B_inv'] @ states['K'][t]
+        X_max[t] = b_inv_diag * K[t]
         
-        states['F_c'][t] = (np.eye(n) - A) @ states['X_max'][t]
+        # (I - A) @ X_max without materialising I - A
+        np.subtract(X_max[t], A @ X_max[t], out=F_c[t])
         
-        sim['Debt'] += P0 @ (states['G'][t] + states['I'][t]) - Taxes
+        Debt += P0 @ (G[t] + I[t]) - Taxes
         
-        sim['Delta_K_e_last'] = Delta_K_e.copy()
+        Delta_K_e_last = Delta_K_e
         
-        sim['Delta_P_last'] = Delta_P.copy()
+        Delta_P_last = Delta_P
+    
+    sim['alpha'] = alpha
+    sim['alpha_shock'] = alpha_shock
+    sim['Delta_C_p_prev'] = Delta_C_p_prev
+    sim['Delta_P_last'] = Delta_P_last
+    sim['Delta_K_e_last'] = Delta_K_e_last
+    sim['Debt'] = Debt
     
     logger.info("Simulation loop complete")
     logger.info("=" * 60)
@@ -263,17 +320,19 @@ def compute_results(sim):
     logger.info("Computing results...")
     
     states = sim['states']
+    state_buffer = sim['state_buffer']
     P0_real = sim['P0_real']
     T = sim['T']
     W = sim['W']
     
-    GDP_real = np.sum(P0_real * states['F'], axis=1)
-    Capacity = np.sum(P0_real * states['F_c'], axis=1)
-    C_plan_value = np.sum(P0_real * states['C_p'], axis=1)
-    C_value = np.sum(P0_real * states['C'], axis=1)
-    G_value = np.sum(P0_real * states['G'], axis=1)
-    AD_value = np.sum(P0_real * states['AD'], axis=1)
-    I_value = np.sum(P0_real * states['I'], axis=1)
+    values = model.aggregate_states(state_buffer, P0_real)
+    GDP_real = values['F']
+    Capacity = values['F_c']
+    C_plan_value = values['C_p']
+    C_value = values['C']
+    G_value = values['G']
+    AD_value = values['AD']
+    I_value = values['I']
     
     Output_Gap = 100 * ((GDP_real - Capacity) / Capacity)
     Capacity_Utilization = 100 * GDP_real / Capacity
@@ -392,7 +451,7 @@ def main():
 
         convergence_results = model.test_neumann_convergence(
             data['A'],
-            data['C_household'] / (model.neumann(data['A'].T, data['va_per_unit'], config['k'])),
+            data['C_household'] / data['P0_real'],
             config['neumann_max_k'],
             config['neumann_tolerance']
         )
@@ -404,11 +463,20 @@ def main():
 
         results = compute_results(sim)
         
+        # Render plots in the background while the CSV files are written
+        plot_process = None
+        if config.get('save_plots', True):
+            plot_process = plotting.generate_all_plots_async(results, config, outdir)
+        
         if config.get('save_csv', True):
             save_results_csv(results, sim['states'], outdir)
         
-        if config.get('save_plots', True):
-            plotting.generate_all_plots(results, config, outdir)
+        if plot_process is not None:
+            plot_process.join()
+            if plot_process.exitcode != 0:
+                raise RuntimeError(
+                    f"Plot generation failed with exit code {plot_process.exitcode}"
+                )
         
         logger.info("=" * 60)
         logger.info("SIMULATION COMPLETE")
@@ -11,25 +11,46 @@ def neumann(A, v, k):
         x += term
     return x
 
-def update_alpha(alpha_prev, shock_prev, sigma, persist, mu):
+def spectral_radius(A, n_iter=50):
+    # Power iteration for the dominant eigenvalue of a non-negative matrix:
+    # k matrix-vector products instead of a full eigendecomposition. The
+    # positive start vector converges to the Perron root.
+    v = np.ones(A.shape[0]) / np.sqrt(A.shape[0])
+    rho = 0.0
+    for _ in range(n_iter):
+        v = A @ v
+        rho = np.linalg.norm(v)
+        if rho == 0:
+            break
+        v /= rho
+    return rho
+
+def update_alpha(alpha_prev, shock_prev, sigma, persist, mu, rng, out=None):
+    # `out`, if given, receives the new shares and must not alias alpha_prev
     n = len(alpha_prev)
-    eps = np.random.normal(0.0, sigma, size=n)
-    shock = persist * shock_prev + eps
+    shock = rng.standard_normal(n)
+    shock *= sigma
+    shock += persist * shock_prev
 
-    alpha_tilde = alpha_prev * np.exp(mu + shock)
+    alpha_tilde = np.add(mu, shock, out=out)
+    np.exp(alpha_tilde, out=alpha_tilde)
+    alpha_tilde *= alpha_prev
     alpha_tilde /= alpha_tilde.sum()
 
     return alpha_tilde, shock
 
 def fit_ar1_gaussian(series):
-    x = np.array(series[:-1])
-    y = np.array(series[1:])
+    x = np.asarray(series[:-1], dtype=float)
+    y = np.asarray(series[1:], dtype=float)
     
-    Xmat = np.column_stack([x, np.ones(len(x))])
-    beta = np.linalg.lstsq(Xmat, y, rcond=None)[0]
+    # Closed-form least squares for a single regressor plus intercept
+    x_mean = x.mean()
+    y_mean = y.mean()
+    x_dev = x - x_mean
+    var = x_dev @ x_dev
     
-    phi = beta[0]
-    c = beta[1]
+    phi = (x_dev @ (y - y_mean)) / var if var != 0 else 0.0
+    c = y_mean - phi * x_mean
     
     residuals = y - (phi * x + c)
     sigma = np.std(residuals, ddof=1)
@@ -69,26 +90,40 @@ def test_neumann_convergence(A, test_vector, k_max, tolerance):
         'tolerance': tolerance * 100
     }
 
+STATE_VARIABLES = (
+    'X',        # Gross output
+    'X_max',    # Capacity (was 'C')
+    'U',        # Unutilized capacity
+    'K',        # Capital stock
+    'K_e',      # Expected capital requirement
+    'I',        # Investment
+    'C_p',      # Expected consumption demand (was 'd_ce')
+    'C_0',      # Initial consumption demand (was 'd_c_0')
+    'C',        # Actual consumption demand (was 'd_c')
+    'F',        # Final demand
+    'ED',       # Excess demand
+    'K_u',      # Unutilized capital
+    'AD',       # Aggregate demand
+    'G',        # Government expenditure
+    'F_c'       # Capacity final demand
+)
+
 def initialize_state_arrays(T, n):
-    return {
-        'X': np.zeros((T, n)),      # Gross output
-        'X_max': np.zeros((T, n)),   # Capacity (was 'C')
-        'U': np.zeros((T, n)),      # Unutilized capacity
-        'K': np.zeros((T, n)),      # Capital stock
-        'K_e': np.zeros((T, n)),    # Expected capital requirement
-        'I': np.zeros((T, n)),      # Investment
-        'C_p': np.zeros((T, n)),    # Expected consumption demand (was 'd_ce')
-        'C_0': np.zeros((T, n)),    # Initial consumption demand (was 'd_c_0')
-        'C': np.zeros((T, n)),      # Actual consumption demand (was 'd_c')
-        'F': np.zeros((T, n)),      # Final demand
-        'ED': np.zeros((T, n)),     # Excess demand
-        'K_u': np.zeros((T, n)),    # Unutilized capital
-        'AD': np.zeros((T, n)),     # Aggregate demand
-        'G': np.zeros((T, n)),      # Government expenditure
-        'F_c': np.zeros((T, n))     # Capacity final demand
-    }
+    # One contiguous (T, n_vars, n) buffer so that every variable at time t
+    # sits next to each other in memory; each state is a (T, n) view into it.
+    # The buffer is returned too, ordered like STATE_VARIABLES.
+    buf = np.zeros((T, len(STATE_VARIABLES), n))
+    states = {name: buf[:, i, :] for i, name in enumerate(STATE_VARIABLES)}
+    return states, buf
 
-def create_delta_matrix(config):
+def aggregate_states(state_buffer, weights):
+    # Sector-weighted totals of every state in one product over the
+    # (T, n_vars, n) buffer from initialize_state_arrays; returns a dict of
+    # (T,) series keyed by STATE_VARIABLES
+    totals = state_buffer @ weights
+    return {name: totals[:, i] for i, name in enumerate(STATE_VARIABLES)}
+
+def create_delta_vector(config, rng):
     n_heavy = config['n_heavy']
     n_medium = config['n_medium']
     n_light = config['n_light']
@@ -99,52 +134,50 @@ def create_delta_matrix(config):
     delta_light_annual = (config['delta_light_min'], config['delta_light_max'])
     
     # Convert to monthly
-    delta_heavy = np.random.uniform(*delta_heavy_annual, n_heavy) / 12
-    delta_medium = np.random.uniform(*delta_medium_annual, n_medium) / 12
-    delta_light = np.random.uniform(*delta_light_annual, n_light) / 12
+    delta_heavy = rng.uniform(*delta_heavy_annual, n_heavy) / 12
+    delta_medium = rng.uniform(*delta_medium_annual, n_medium) / 12
+    delta_light = rng.uniform(*delta_light_annual, n_light) / 12
     
-    # Concatenate and create diagonal matrix
+    # Concatenate into the diagonal of the depreciation matrix
     delta_vec = np.concatenate([delta_heavy, delta_medium, delta_light])
-    Delta = np.diag(delta_vec)
     
-    logger.info(f"Created depreciation matrix with rates: "
+    logger.info(f"Created depreciation rates: "
                 f"heavy={np.mean(delta_heavy)*12:.3f}, "
                 f"medium={np.mean(delta_medium)*12:.3f}, "
                 f"light={np.mean(delta_light)*12:.3f} (annual)")
     
-    return Delta
+    return delta_vec
 
-def create_capital_intensity_matrix(config):
+def create_capital_intensity_vector(config, rng):
     n_heavy = config['n_heavy']
     n_medium = config['n_medium']
     n_light = config['n_light']
     
-    heavy_diag = np.random.uniform(
+    heavy_diag = rng.uniform(
         config['heavy_diag_min'],
         config['heavy_diag_max'],
         n_heavy
     )
-    medium_diag = np.random.uniform(
+    medium_diag = rng.uniform(
         config['medium_diag_min'],
         config['medium_diag_max'],
         n_medium
     )
-    light_diag = np.random.uniform(
+    light_diag = rng.uniform(
         config['light_diag_min'],
         config['light_diag_max'],
         n_light
     )
     
     all_diag = np.concatenate([heavy_diag, medium_diag, light_diag])
-    B = np.diag(all_diag)
-    B_inv = np.linalg.inv(B)
+    inv_diag = 1.0 / all_diag
     
-    logger.info(f"Created capital intensity matrix with means: "
+    logger.info(f"Created capital intensities with means: "
                 f"heavy={np.mean(heavy_diag):.3f}, "
                 f"medium={np.mean(medium_diag):.3f}, "
                 f"light={np.mean(light_diag):.3f}")
     
-    return B, B_inv
+    return all_diag, inv_diag
 
 def create_mu_vector(config):
     n = config['n']
@@ -166,58 +199,61 @@ class AR1Forecaster:
     """
     def __init__(self, window_size):
         self.window_size = window_size
-        self.history = []
+        # Ring buffer of the last window_size observations, allocated on the
+        # first observation once the number of variables is known
+        self.buffer = None
+        self.n_observations = 0
         self.phi = None
         self.c = None
         self.sigma = None
         self.is_fitted = False
     
+    @property
+    def history(self):
+        """Observations currently in the window, oldest first"""
+        if self.buffer is None:
+            return np.empty(0)
+        count = min(self.n_observations, self.window_size)
+        order = np.arange(self.n_observations - count, self.n_observations)
+        return self.buffer[order % self.window_size]
+    
     def add_observation(self, value):
         """Add a new observation to history"""
-        self.history.append(value.copy() if hasattr(value, 'copy') else value)
+        if self.buffer is None:
+            self.buffer = np.empty((self.window_size,) + np.shape(value))
         
-        # Keep only the last window_size observations
-        if len(self.history) > self.window_size:
-            self.history.pop(0)
+        # Copy straight into the oldest slot once the window is full
+        self.buffer[self.n_observations % self.window_size] = value
+        self.n_observations += 1
     
     def fit(self):
         """Fit AR(1) model to current history"""
-        if len(self.history) < 2:
+        if self.n_observations < 2:
             self.is_fitted = False
             return
         
-        n_vars = len(self.history[0]) if hasattr(self.history[0], '__len__') else 1
+        hist_array = self.history
+        univariate = hist_array.ndim == 1
+        if univariate:
+            hist_array = hist_array[:, None]
         
-        if n_vars == 1:
-            # Univariate case
-            x = np.array(self.history[:-1])
-            y = np.array(self.history[1:])
-            
-            X = np.column_stack([x, np.ones(len(x))])
-            beta = np.linalg.lstsq(X, y, rcond=None)[0]
-            
-            self.phi = beta[0]
-            self.c = beta[1]
-            self.sigma = np.std(y - (self.phi * x + self.c), ddof=1)
-            
+        # Fit independent AR(1) for each variable in one batched solve.
+        # pinv with lstsq's default cutoff keeps the rank decisions of the
+        # per-variable lstsq calls it replaces.
+        x = hist_array[:-1].T
+        y = hist_array[1:].T
+        X = np.stack([x, np.ones_like(x)], axis=-1)
+        rcond = np.finfo(float).eps * max(X.shape[1:])
+        beta = np.einsum('ikm,im->ik', np.linalg.pinv(X, rcond=rcond), y)
+        
+        phi = beta[:, 0]
+        c = beta[:, 1]
+        sigma = np.std(y - (phi[:, None] * x + c[:, None]), axis=1, ddof=1)
+        
+        if univariate:
+            self.phi, self.c, self.sigma = phi[0], c[0], sigma[0]
         else:
-            # Multivariate case - fit independent AR(1) for each variable
-            self.phi = np.zeros(n_vars)
-            self.c = np.zeros(n_vars)
-            self.sigma = np.zeros(n_vars)
-            
-            hist_array = np.array(self.history)
-            
-            for i in range(n_vars):
-                x = hist_array[:-1, i]
-                y = hist_array[1:, i]
-                
-                X = np.column_stack([x, np.ones(len(x))])
-                beta = np.linalg.lstsq(X, y, rcond=None)[0]
-                
-                self.phi[i] = beta[0]
-                self.c[i] = beta[1]
-                self.sigma[i] = np.std(y - (self.phi[i] * x + self.c[i]), ddof=1)
+            self.phi, self.c, self.sigma = phi, c, sigma
         
         self.is_fitted = True
     
@@ -230,7 +266,8 @@ class AR1Forecaster:
             raise ValueError("Model not fitted yet")
         
         predictions = []
-        current = last_value.copy() if hasattr(last_value, 'copy') else last_value
+        # last_value is only read, never modified, so no defensive copy
+        current = last_value
         
         for _ in range(n_steps):
             if hasattr(self.phi, '__len__'):
@@ -245,24 +282,28 @@ class AR1Forecaster:
         
         return predictions[0] if n_steps == 1 else predictions
     
-    def predict_with_uncertainty(self, last_value, n_steps=1, n_simulations=1000):
+    def predict_with_uncertainty(self, last_value, n_steps=1, n_simulations=1000,
+                                 rng=None):
         """
         Predict with uncertainty intervals using Monte Carlo simulation
         """
         if not self.is_fitted:
             raise ValueError("Model not fitted yet")
         
+        if rng is None:
+            rng = np.random.default_rng()
+        
         predictions = []
         for _ in range(n_simulations):
             sim_pred = []
-            current = last_value.copy() if hasattr(last_value, 'copy') else last_value
+            current = last_value
             
             for _ in range(n_steps):
                 if hasattr(self.phi, '__len__'):
-                    noise = np.random.normal(0, self.sigma, len(self.phi))
+                    noise = rng.normal(0, self.sigma, len(self.phi))
                     next_val = self.phi * current + self.c + noise
                 else:
-                    noise = np.random.normal(0, self.sigma)
+                    noise = rng.normal(0, self.sigma)
                     next_val = self.phi * current + self.c + noise
                 
                 sim_pred.append(next_val)
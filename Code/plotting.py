@@ -5,13 +5,67 @@ This module handles all plot generation and styling.
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
 import matplotlib as mpl
+# Plots are only ever written to files, so skip GUI canvas setup entirely
+mpl.use("Agg", force=True)
+import matplotlib.pyplot as plt
+from matplotlib import font_manager
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
+from matplotlib.markers import MarkerStyle
+from matplotlib.ticker import ScalarFormatter
+import io
 import os
+import atexit
 import logging
+from logging.handlers import QueueHandler, QueueListener
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+
+# Optional: feature-preserving downsampling for long series
+try:
+    from tsdownsample import MinMaxLTTBDownsampler
+except ImportError:
+    MinMaxLTTBDownsampler = None
+
+# Optional: fused, multithreaded evaluation of elementwise expressions
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on points drawn per series, roughly the width of a saved plot
+MAX_PLOT_POINTS = 2000
+
+# zlib level 1 encodes PNGs several times faster than the default level 6
+# for slightly larger files
+PNG_PIL_KWARGS = {"compress_level": 1}
+
+
+# Scientific-notation y-axis shared by the three-series plots; a formatter
+# is attached to one axis at a time, and plots are drawn one after another
+_SCI_FMT = ScalarFormatter(useMathText=True)
+_SCI_FMT.set_scientific(True)
+_SCI_FMT.set_powerlimits((0, 0))
+
+
+SERIF_FONTS = ["Times New Roman", "STIXGeneral", "DejaVu Serif"]
+
+
+def _first_available_font(families):
+    """
+    Return the first of ``families`` that is installed, else the last one.
+    """
+    for family in families:
+        try:
+            font_manager.findfont(family, fallback_to_default=False)
+            return family
+        except ValueError:
+            continue
+    return families[-1]
+
 
 def setup_plot_style(config):
     """
@@ -25,7 +79,8 @@ def setup_plot_style(config):
     mpl.rcParams.update({
         # Font
         "font.family": "serif",
-        "font.serif": ["Times New Roman", "STIXGeneral", "DejaVu Serif"],
+        # Resolve the fallback chain once so later figures skip the search
+        "font.serif": [_first_available_font(SERIF_FONTS)],
         "mathtext.fontset": "stix",
         # Sizes
         "font.size": config.get('font_size', 11),
@@ -41,6 +96,11 @@ def setup_plot_style(config):
         "figure.figsize": (config.get('figure_width', 6.5), 
                           config.get('figure_height', 4)),
         "figure.dpi": config.get('figure_dpi', 150),
+        # Fixed margins shared by every plot, in place of tight_layout
+        "figure.subplot.left": 0.12,
+        "figure.subplot.right": 0.95,
+        "figure.subplot.bottom": 0.13,
+        "figure.subplot.top": 0.9,
         # Axes
         "axes.spines.top": False,
         "axes.spines.right": False,
@@ -49,8 +109,144 @@ def setup_plot_style(config):
     logger.info("Plot style configured")
 
 
+def skip_data(data, skip):
+    """
+    Reduce a series to roughly every (skip+1)th point for plotting.
+    
+    When tsdownsample is installed the points are chosen with MinMaxLTTB,
+    which keeps the peaks and troughs that plain striding can drop;
+    otherwise every (skip+1)th point is taken. At most ``MAX_PLOT_POINTS``
+    points are returned either way.
+    
+    Parameters
+    ----------
+    data : ndarray
+        Series to reduce
+    skip : int
+        Number of points to skip between kept points
+        
+    Returns
+    -------
+    x_vals, plot_data : ndarray
+        Indices of the kept points and their values
+    """
+    n_points = len(data)
+    step = max(skip + 1, -(-n_points // MAX_PLOT_POINTS))
+    if step <= 1:
+        return np.arange(n_points), data
+    
+    n_out = -(-n_points // step)
+    if MinMaxLTTBDownsampler is not None and n_out > 2:
+        indices = MinMaxLTTBDownsampler().downsample(
+            np.ascontiguousarray(data), n_out=n_out
+        )
+        # The kept indices are the x-values themselves
+        return indices, data[indices]
+    # A strided slice is a view, so plain striding copies nothing
+    return np.arange(0, n_points, step), data[::step]
+
+
+def _marker_path(marker):
+    """
+    Return the path of a marker style, scaled to a 1-point marker.
+    """
+    style = MarkerStyle(marker)
+    return style.get_path().transformed(style.get_transform())
+
+
+def _save_figure(fig, outdir, filename, dpi):
+    """
+    Render ``fig`` to PNG in memory, then write the file in a single step.
+    
+    The bytes go to a temporary file that is renamed over the target, so a
+    crash never leaves a partially written plot behind.
+    """
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=dpi, pil_kwargs=PNG_PIL_KWARGS)
+    filepath = os.path.join(outdir, filename)
+    tmp_path = filepath + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(buf.getbuffer())
+    os.replace(tmp_path, filepath)
+
+
+def _get_axes(ax):
+    """
+    Return ``(fig, ax, owns_figure)``, creating a new figure if ``ax`` is None.
+    """
+    if ax is None:
+        fig, ax = plt.subplots()
+        return fig, ax, True
+    return ax.figure, ax, False
+
+
+def _release_axes(fig, ax, owns_figure):
+    """
+    Close a figure created by ``_get_axes``, or clear a caller's axes for reuse.
+    """
+    if owns_figure:
+        plt.close(fig)
+    else:
+        ax.cla()
+
+
+class PlotContext:
+    """
+    Figure reused across single-series plots by updating its artists.
+    
+    The axes, labels, series line and zero line are created once; each
+    ``save_plot`` call only swaps in the new data and title and rescales
+    before saving, instead of clearing and rebuilding the axes.
+    
+    Parameters
+    ----------
+    ax : matplotlib.axes.Axes, optional
+        Axes to draw on, cleared again by ``close``; a new figure is created
+        if not given
+    """
+    def __init__(self, ax=None):
+        self.fig, self.ax, self._owns_figure = _get_axes(ax)
+        self.line, = self.ax.plot([], [], rasterized=True)
+        self.zero_line = self.ax.axhline(0, linestyle="--", linewidth=0.8,
+                                         alpha=0.6, visible=False)
+        self.ax.set_xlabel("Time")
+    
+    def save_plot(self, data, title, filename, outdir, zero_line=False,
+                  ylim=None, marker="o", linestyle="-", markevery=1,
+                  skip_points=1, dpi=300):
+        """
+        Update the plot with a new series and save it.
+        
+        Takes the same arguments as the module-level ``save_plot``.
+        """
+        x_vals, plot_data = skip_data(data, skip_points)
+        self.line.set_data(x_vals, plot_data)
+        self.line.set_marker(marker)
+        self.line.set_linestyle(linestyle)
+        self.line.set_markevery(1 if len(plot_data) < len(data) else markevery)
+        self.zero_line.set_visible(zero_line)
+        
+        # Rescale to the visible artists only, so a hidden zero line does
+        # not stretch the y-range
+        self.ax.relim(visible_only=True)
+        if ylim is not None:
+            self.ax.set_ylim(*ylim)
+        else:
+            self.ax.set_autoscaley_on(True)
+        self.ax.autoscale_view()
+        self.ax.set_title(title)
+        
+        _save_figure(self.fig, outdir, filename, dpi)
+        logger.info(f"Saved plot: {filename}")
+    
+    def close(self):
+        """Close the figure, or clear the caller's axes if one was given."""
+        _release_axes(self.fig, self.ax, self._owns_figure)
+
+
 def save_plot(data, title, filename, outdir, zero_line=False, ylim=None, 
-              marker="o", linestyle="-", markevery=1, skip_points=1, dpi=300):
+              marker="o", linestyle="-", markevery=1, skip_points=1, dpi=300,
+              ax=None):
     """
     Create and save a single-series plot.
     
@@ -78,36 +274,22 @@ def save_plot(data, title, filename, outdir, zero_line=False, ylim=None,
         Show every (skip_points+1)th point
     dpi : int, optional
         Resolution for saved figure
+    ax : matplotlib.axes.Axes, optional
+        Axes to draw on and clear afterwards; a new figure is created and
+        closed if not given
     """
-    fig, ax = plt.subplots()
-    
-    # Reduce data density if requested
-    if skip_points > 0:
-        indices = np.arange(0, len(data), skip_points + 1)
-        plot_data = data[indices]
-        x_vals = np.arange(len(data))[indices]
-        ax.plot(x_vals, plot_data, marker=marker, linestyle=linestyle, 
-                markevery=1)
-    else:
-        ax.plot(data, marker=marker, linestyle=linestyle, markevery=markevery)
-    
-    if zero_line:
-        ax.axhline(0, linestyle="--", linewidth=0.8, alpha=0.6)
-    if ylim is not None:
-        ax.set_ylim(*ylim)
-    ax.set_xlabel("Time")
-    ax.set_title(title)
-    fig.tight_layout()
-    
-    filepath = os.path.join(outdir, filename)
-    fig.savefig(filepath, dpi=dpi)
-    plt.close(fig)
-    logger.info(f"Saved plot: {filename}")
+    context = PlotContext(ax)
+    try:
+        context.save_plot(data, title, filename, outdir, zero_line=zero_line,
+                          ylim=ylim, marker=marker, linestyle=linestyle,
+                          markevery=markevery, skip_points=skip_points, dpi=dpi)
+    finally:
+        context.close()
 
 
 def save_plot_three(series1, series2, series3, label1, label2, label3, 
                    title, filename, outdir, zero_line=False, skip_points=1, 
-                   dpi=300):
+                   dpi=300, ax=None):
     """
     Create and save a three-series comparison plot.
     
@@ -129,44 +311,45 @@ def save_plot_three(series1, series2, series3, label1, label2, label3,
         Show every (skip_points+1)th point
     dpi : int, optional
         Resolution for saved figure
+    ax : matplotlib.axes.Axes, optional
+        Axes to draw on and clear afterwards; a new figure is created and
+        closed if not given
     """
-    fig, ax = plt.subplots()
-    
-    # Helper function to apply skipping
-    def skip_data(data, skip):
-        if skip > 0:
-            indices = np.arange(0, len(data), skip + 1)
-            plot_data = data[indices]
-            x_vals = np.arange(len(data))[indices]
-            return x_vals, plot_data
-        return np.arange(len(data)), data
+    fig, ax, owns_figure = _get_axes(ax)
     
-    x1, y1 = skip_data(series1, skip_points)
-    x2, y2 = skip_data(series2, skip_points)
-    x3, y3 = skip_data(series3, skip_points)
+    labels = (label1, label2, label3)
+    linestyles = ("-", "--", ":")
+    markers = ("o", "s", "^")
+    colors = [prop["color"] for prop, _ in zip(mpl.rcParams["axes.prop_cycle"], labels)]
+    points = [np.column_stack(skip_data(series, skip_points))
+              for series in (series1, series2, series3)]
     
-    ax.plot(x1, y1, label=label1, marker="o", linestyle="-", markevery=1)
-    ax.plot(x2, y2, label=label2, marker="s", linestyle="--", markevery=1)
-    ax.plot(x3, y3, label=label3, marker="^", linestyle=":", markevery=1)
+    # Two artists for all three series: one collection for the lines and
+    # one for the markers, with a marker shape per point
+    ax.add_collection(LineCollection(points, colors=colors, linestyles=linestyles,
+                                     rasterized=True))
+    counts = [len(xy) for xy in points]
+    scatter = ax.scatter(*np.concatenate(points).T,
+                         s=mpl.rcParams["lines.markersize"]**2,
+                         c=np.repeat(mpl.colors.to_rgba_array(colors), counts, axis=0),
+                         zorder=2, rasterized=True)
+    scatter.set_paths([path for marker, count in zip(markers, counts)
+                       for path in [_marker_path(marker)] * count])
+    ax.autoscale_view()
     
     if zero_line:
         ax.axhline(0, linestyle="--", linewidth=0.8, alpha=0.6)
     ax.set_xlabel("Time")
     ax.set_ylabel("Euros (constant prices)")
     ax.set_title(title)
-    ax.legend(frameon=False, loc="best")
+    handles = [Line2D([], [], color=color, linestyle=linestyle, marker=marker, label=label)
+               for color, linestyle, marker, label in zip(colors, linestyles, markers, labels)]
+    ax.legend(handles=handles, frameon=False, loc="best")
     
-    from matplotlib.ticker import ScalarFormatter
-    formatter = ScalarFormatter(useMathText=True)
-    formatter.set_scientific(True)
-    formatter.set_powerlimits((0, 0))
-    ax.yaxis.set_major_formatter(formatter)
+    ax.yaxis.set_major_formatter(_SCI_FMT)
     
-    fig.tight_layout()
-    
-    filepath = os.path.join(outdir, filename)
-    fig.savefig(filepath, dpi=dpi)
-    plt.close(fig)
+    _save_figure(fig, outdir, filename, dpi)
+    _release_axes(fig, ax, owns_figure)
     logger.info(f"Saved plot: {filename}")
 
 
@@ -198,9 +381,8 @@ def plot_neumann_convergence(convergence_results, outdir, dpi=300):
     ax.legend()
     plt.tight_layout()
     
-    filepath = os.path.join(outdir, "neumann_convergence.png")
-    plt.savefig(filepath, dpi=dpi)
-    plt.close()
+    _save_figure(fig, outdir, "neumann_convergence.png", dpi)
+    plt.close(fig)
     logger.info(f"Saved convergence plot: neumann_convergence.png")
 
 
@@ -222,7 +404,47 @@ def quarterly_average(series, start=0):
     """
     trimmed = series[start:]
     n_quarters = len(trimmed) // 3
-    return trimmed[:3*n_quarters].reshape(n_quarters, 3).mean(axis=1)
+    months = trimmed[:3*n_quarters]
+    # Add the three strided month-of-quarter views, then scale
+    return (months[0::3] + months[1::3] + months[2::3]) * (1.0 / 3.0)
+
+
+def _start_log_listener():
+    """
+    Start relaying log records sent to a queue to this process's handlers.
+    
+    Returns ``(log_queue, listener)``; call ``listener.stop()`` once the
+    processes writing to ``log_queue`` have finished.
+    """
+    root = logging.getLogger()
+    log_queue = mp.Queue()
+    listener = QueueListener(log_queue, *root.handlers,
+                             respect_handler_level=True)
+    listener.start()
+    return log_queue, listener
+
+
+def _forward_logging(log_queue, level):
+    """
+    Send every log record of this process to ``log_queue``.
+    
+    Child processes do not inherit logging handlers under the spawn and
+    forkserver start methods, so their records are relayed to the parent.
+    """
+    root = logging.getLogger()
+    root.handlers[:] = [QueueHandler(log_queue)]
+    root.setLevel(level)
+
+
+def _init_plot_worker(config, log_queue=None, log_level=logging.INFO):
+    """
+    Prepare a plotting worker process with the configured plot style.
+    
+    If ``log_queue`` is given, the worker's log records are sent to it.
+    """
+    if log_queue is not None:
+        _forward_logging(log_queue, log_level)
+    setup_plot_style(config)
 
 
 def generate_all_plots(results, config, outdir):
@@ -249,66 +471,160 @@ def generate_all_plots(results, config, outdir):
     dpi = config.get('plot_dpi', 300)
     skip = config.get('plot_skip_points', 1)
     
-    # Extract results
-    G_value = results['G_value']
-    C_value = results['C_value']
-    C_plan_value = results['C_plan_value']
-    I_value = results['I_value']
-    Output_Gap = results['Output_Gap']
-    Capacity_Utilization = results['Capacity_Utilization']
-    GDP_real = results['GDP_real']
-    Capacity = results['Capacity']
-    AD_value = results['AD_value']
-    
-    # Individual plots
-    save_plot(G_value[W:T], "Government Expenditure (real value)", 
-              "Government.png", outdir, zero_line=True, skip_points=skip, dpi=dpi)
-    
-    save_plot(C_value[W:T], "Consumption (real value)", 
-              "Consumption.png", outdir, zero_line=True, skip_points=skip, dpi=dpi)
-    
-    save_plot(100*(C_value[W:T] - C_plan_value[W:T])/(C_plan_value[W:T]), 
-              "Excess demand percentage(%)", "Excess_demand.png", outdir, 
-              zero_line=True, skip_points=skip, dpi=dpi)
-    
-    save_plot(I_value[W:T], "Investment (real value)", 
-              "Investment.png", outdir, zero_line=True, skip_points=skip, dpi=dpi)
-    
-    save_plot(Output_Gap[W:T], "Output Gap Percentage (%)", 
-              "Output_gap.png", outdir, zero_line=True, skip_points=skip, dpi=dpi)
-    
-    save_plot(Capacity_Utilization[W:T], "Capacity utilization (%)", 
-              "Utilization.png", outdir, zero_line=True, skip_points=skip, dpi=dpi)
-    
-    # Three-series plots
-    save_plot_three(
-        GDP_real[W:T], Capacity[W:T], AD_value[W:T], 
-        label1="Real GDP",
-        label2="Potential GDP",
-        label3="Aggregate Demand",
-        title="GDP, Potential GDP, and Aggregate Demand",
-        filename="GDP_Capacity_AD.png",
-        outdir=outdir,
-        zero_line=False,
-        skip_points=skip,
-        dpi=dpi
-    )
+    # Extract the plotted window [W, T) of each result once
+    G_value = results['G_value'][W:T]
+    C_value = results['C_value'][W:T]
+    C_plan_value = results['C_plan_value'][W:T]
+    I_value = results['I_value'][W:T]
+    Output_Gap = results['Output_Gap'][W:T]
+    Capacity_Utilization = results['Capacity_Utilization'][W:T]
+    GDP_real = results['GDP_real'][W:T]
+    Capacity = results['Capacity'][W:T]
+    AD_value = results['AD_value'][W:T]
     
-    # Quarterly plots
-    GDP_q = quarterly_average(GDP_real, start=W)
-    Capacity_q = quarterly_average(Capacity, start=W)
-    AD_q = quarterly_average(AD_value, start=W)
-    
-    save_plot_three(
-        GDP_q, Capacity_q, AD_q,
-        label1="Real GDP (quarterly avg)",
-        label2="Potential GDP (quarterly avg)",
-        label3="Aggregate Demand (quarterly avg)",
-        title="GDP, Potential GDP, and Aggregate Demand (Quarterly)",
-        filename="GDP_Capacity_AD_quarterly.png",
-        outdir=outdir,
-        zero_line=False,
-        dpi=dpi
-    )
+    # Excess demand (%) = 100 * (C - C_plan) / C_plan, in a single buffer
+    if numexpr is not None:
+        excess_demand = numexpr.evaluate(
+            "100 * (C - C_plan) / C_plan",
+            local_dict={"C": C_value, "C_plan": C_plan_value}
+        )
+    else:
+        excess_demand = np.subtract(C_value, C_plan_value)
+        np.divide(excess_demand, C_plan_value, out=excess_demand)
+        excess_demand *= 100
+    
+    # Quarterly averages
+    GDP_q = quarterly_average(GDP_real)
+    Capacity_q = quarterly_average(Capacity)
+    AD_q = quarterly_average(AD_value)
+    
+    # Options shared by every single-series plot, bound once; jobs stay
+    # plain (function, args, kwargs) tuples so they pickle to workers
+    series_options = dict(zero_line=True, skip_points=skip, dpi=dpi)
+    
+    # Each plot is an independent (function, args, kwargs) job
+    jobs = [
+        # Individual plots
+        (save_plot, (G_value, "Government Expenditure (real value)", 
+                     "Government.png", outdir),
+         series_options),
+        (save_plot, (C_value, "Consumption (real value)", 
+                     "Consumption.png", outdir),
+         series_options),
+        (save_plot, (excess_demand, "Excess demand percentage(%)", 
+                     "Excess_demand.png", outdir),
+         series_options),
+        (save_plot, (I_value, "Investment (real value)", 
+                     "Investment.png", outdir),
+         series_options),
+        (save_plot, (Output_Gap, "Output Gap Percentage (%)", 
+                     "Output_gap.png", outdir),
+         series_options),
+        (save_plot, (Capacity_Utilization, "Capacity utilization (%)", 
+                     "Utilization.png", outdir),
+         series_options),
+        # Three-series plots
+        (save_plot_three, (GDP_real, Capacity, AD_value),
+         dict(label1="Real GDP",
+              label2="Potential GDP",
+              label3="Aggregate Demand",
+              title="GDP, Potential GDP, and Aggregate Demand",
+              filename="GDP_Capacity_AD.png",
+              outdir=outdir,
+              zero_line=False,
+              skip_points=skip,
+              dpi=dpi)),
+        (save_plot_three, (GDP_q, Capacity_q, AD_q),
+         dict(label1="Real GDP (quarterly avg)",
+              label2="Potential GDP (quarterly avg)",
+              label3="Aggregate Demand (quarterly avg)",
+              title="GDP, Potential GDP, and Aggregate Demand (Quarterly)",
+              filename="GDP_Capacity_AD_quarterly.png",
+              outdir=outdir,
+              zero_line=False,
+              dpi=dpi)),
+    ]
+    
+    n_workers = config.get('plot_workers', 0) or os.cpu_count() or 1
+    n_workers = min(n_workers, len(jobs))
+    
+    if n_workers > 1:
+        # Rendering and PNG encoding hold the GIL, so fan out to processes;
+        # their log records are relayed back through a queue
+        log_queue, listener = _start_log_listener()
+        log_level = logging.getLogger().getEffectiveLevel()
+        try:
+            with ProcessPoolExecutor(max_workers=n_workers,
+                                     initializer=_init_plot_worker,
+                                     initargs=(config, log_queue, log_level)) as pool:
+                futures = [pool.submit(func, *args, **kwargs)
+                           for func, args, kwargs in jobs]
+                for future in futures:
+                    future.result()
+        finally:
+            listener.stop()
+    else:
+        # Figures are reused across plots; building a new figure per plot
+        # costs more than drawing it. Single-series plots only update the
+        # artists of one context, the rest share one cleared axes.
+        context = PlotContext()
+        fig, ax = plt.subplots()
+        for func, args, kwargs in jobs:
+            if func is save_plot:
+                context.save_plot(*args, **kwargs)
+            else:
+                func(*args, ax=ax, **kwargs)
+        context.close()
+        plt.close(fig)
     
     logger.info(f"All plots saved to {outdir}")
+
+
+def _generate_all_plots_worker(results, config, outdir, log_queue, log_level):
+    """
+    Entry point of the background plotting process.
+    """
+    _init_plot_worker(config, log_queue, log_level)
+    try:
+        generate_all_plots(results, config, outdir)
+    except Exception:
+        # Record the traceback in the parent's log, not only on stderr
+        logger.exception("Plot generation failed")
+        raise
+
+
+def generate_all_plots_async(results, config, outdir):
+    """
+    Generate all simulation output plots in a background process.
+    
+    Returns immediately; the caller can keep working while the plots are
+    rendered. Log records of the plotting process are passed to this
+    process's handlers. The process is joined at interpreter exit if the
+    caller does not join it first.
+    
+    Parameters
+    ----------
+    results : dict
+        Dictionary containing simulation results
+    config : dict
+        Configuration dictionary
+    outdir : str
+        Output directory
+        
+    Returns
+    -------
+    multiprocessing.Process
+        The started plotting process; check ``exitcode`` after ``join()``
+    """
+    log_queue, listener = _start_log_listener()
+    process = mp.Process(
+        target=_generate_all_plots_worker,
+        args=(results, config, outdir, log_queue,
+              logging.getLogger().getEffectiveLevel()),
+        name="plotting"
+    )
+    process.start()
+    # atexit runs in reverse order: join the process, then drain its logs
+    atexit.register(listener.stop)
+    atexit.register(process.join)
+    return process
@@ -50,13 +50,11 @@ def main():
     data = data_loader.load_all_data(config, str(data_dir))
     
     print(f"  Loaded {config['n']}x{config['n']} IO matrix")
-    print(f"  Spectral radius of A: {np.max(np.abs(np.linalg.eigvals(data['A']))):.4f}")
+    print(f"  Spectral radius of A: {model.spectral_radius(data['A']):.4f}")
     
     # Test Neumann convergence
     print("\nTesting Neumann series convergence...")
-    test_vector = data['C_household'] / model.neumann(
-        data['A'].T, data['va_per_unit'], config['k']
-    )
+    test_vector = data['C_household'] / data['P0_real']
     
     convergence = model.test_neumann_convergence(
         data['A'],